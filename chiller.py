@@ -1,6 +1,10 @@
-import time
+import logging
+import os
+import selectors
 import serial
 
+log = logging.getLogger("chiller")
+
 # Mapping for standard "in" commands.
 RESPONSES = {
     "VERSION": "JULABO_V3.0",
@@ -14,6 +18,54 @@ RESPONSES = {
     "in_pv_01": "-100",
 }
 
+# Ready-to-send replies, keyed by the raw command bytes.
+RESPONSES_B = {k.encode("ascii"): (v + "\r\n").encode("ascii") for k, v in RESPONSES.items()}
+OK_B = b"OK\r\n"
+CHILLER_ON_B = b"Chiller turned on\r\n"
+CHILLER_OFF_B = b"Chiller turned off\r\n"
+MISSING_SP_B = b"Missing parameter for out_sp_00\r\n"
+MISSING_MODE_B = b"Missing parameter for out_mode_05\r\n"
+
+def handle_sp(arg):
+    if not arg:
+        return MISSING_SP_B
+    return b"Setpoint updated to " + arg + b"\r\n"
+
+def handle_mode(arg):
+    if not arg:
+        return MISSING_MODE_B
+    return CHILLER_ON_B if arg == b"1" else CHILLER_OFF_B
+
+# Parameterised "out" commands, keyed by the verb before the first space.
+HANDLERS = {
+    b"out_sp_00": handle_sp,
+    b"out_mode_05": handle_mode,
+}
+
+# POSIX ports: block on the file descriptor until it is readable (no idle
+# wakeups), then drain everything available in one read.
+def _posix_reader(ser):
+    sel = selectors.DefaultSelector()
+    sel.register(ser.fileno(), selectors.EVENT_READ)
+    def read_chunk():
+        sel.select()
+        try:
+            data = os.read(ser.fileno(), 4096)
+        except OSError as e:
+            raise serial.SerialException(f"read failed: {e}") from e
+        # A readable fd that returns no data means the peer hung up.
+        if not data:
+            raise serial.SerialException("device disconnected")
+        return data
+    return read_chunk
+
+# Other platforms (e.g. Windows COM ports) cannot be registered with a
+# selector; let pyserial wait for the first byte, then drain the rest.
+def _pyserial_reader(ser):
+    def read_chunk():
+        return ser.read(ser.in_waiting or 1)
+    return read_chunk
+
 def simulate_chiller():
     ser = serial.Serial(
         port="/tmp/ttyV1",  # Adjust for your system (e.g., COMx on Windows)
@@ -23,32 +75,42 @@ def simulate_chiller():
         stopbits=serial.STOPBITS_ONE,
         timeout=1,
     )
-    print("Simulated chiller is running. Waiting for commands...")
-    while True:
-        # Read command terminated by CR (0x0D)
-        data = ser.read_until(b'\r').decode("ascii").strip()
-        if data:
-            print(f"Simulated Chiller Received: {data}")
-            if data.startswith("out_sp_00"):
-                parts = data.split(" ", 1)
-                if len(parts) > 1:
-                    response = f"Setpoint updated to {parts[1]}"
+    log.info("Simulated chiller is running. Waiting for commands...")
+    debug = log.isEnabledFor(logging.DEBUG)
+    read_chunk = _posix_reader(ser) if os.name == "posix" else _pyserial_reader(ser)
+    buf = bytearray()
+    try:
+        while True:
+            buf.extend(read_chunk())
+            # Commands are terminated by CR (0x0D).
+            while True:
+                end = buf.find(b"\r")
+                if end < 0:
+                    break
+                data = bytes(buf[:end]).strip()
+                del buf[:end + 1]
+                if not data:
+                    continue
+                if debug:
+                    log.debug("Simulated Chiller Received: %s", data.decode("ascii", errors="ignore"))
+                verb, _, arg = data.partition(b" ")
+                handler = HANDLERS.get(verb)
+                if handler is not None:
+                    response = handler(arg)
                 else:
-                    response = "Missing parameter for out_sp_00"
-            elif data.startswith("out_mode_05"):
-                parts = data.split(" ", 1)
-                if len(parts) > 1:
-                    response = "Chiller turned on" if parts[1] == "1" else "Chiller turned off"
-                else:
-                    response = "Missing parameter for out_mode_05"
-            else:
-                response = RESPONSES.get(data, "OK")
-            full_response = response + "\r\n"
-            time.sleep(0.05)
-            ser.write(full_response.encode("ascii"))
-            print(f"Simulated Chiller Sent: {response}")
-        else:
-            time.sleep(0.05)
+                    response = RESPONSES_B.get(data, OK_B)
+                ser.write(response)
+                if debug:
+                    log.debug("Simulated Chiller Sent: %s", response.decode("ascii", errors="ignore").rstrip())
+    except serial.SerialException as e:
+        log.error("Simulated chiller stopped: %s", e)
+    finally:
+        ser.close()
 
 if __name__ == "__main__":
+    # Per-command traffic is only logged when CHILLER_DEBUG is set.
+    logging.basicConfig(
+        format="%(message)s",
+        level=logging.DEBUG if os.getenv("CHILLER_DEBUG") else logging.INFO,
+    )
     simulate_chiller()
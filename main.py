@@ -1,84 +1,270 @@
 import sys
 import time
+import queue
+import struct
 import serial
 import serial.tools.list_ports
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit,
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit,
     QLabel, QListWidget, QListWidgetItem, QAbstractItemView, QGroupBox,
     QTabWidget, QCheckBox, QComboBox, QLineEdit, QFormLayout
 )
-from PySide6.QtCore import QObject, QThread, Signal, Qt
-
-# Worker class: accepts a list of (command, parameter) tuples,
-# an optional inter_byte_timeout, a flag to append newline,
-# a per-byte transmission delay, and a command delay between commands,
-# plus port configuration parameters.
+from PySide6.QtCore import QObject, QThread, Signal, Qt, QSignalBlocker
+
+# Initial size of the worker's receive buffer; it grows for longer replies.
+RESPONSE_CHUNK = 256
+
+# Worker log lines are emitted to the GUI in batches of this many lines,
+# or after this many seconds, whichever comes first.
+LOG_BATCH_LINES = 8
+LOG_BATCH_INTERVAL = 0.1
+# Scrollback kept in the log view; older lines are discarded.
+LOG_MAX_LINES = 2000
+
+# Built-in "out" commands that take a parameter, in display order, and the
+# same names as a set for membership tests.
+OUT_COMMANDS = ("out_sp_00", "out_mode_05")
+OUT_CMD_SET = frozenset(OUT_COMMANDS)
+# Prefix of Julabo set commands, which send no reply.
+SET_COMMAND_PREFIX = "out_"
+
+# Port setting combo box choices mapped to pyserial constants.
+BYTESIZES = {"7": serial.SEVENBITS, "8": serial.EIGHTBITS}
+PARITIES = {"N": serial.PARITY_NONE, "E": serial.PARITY_EVEN, "O": serial.PARITY_ODD}
+STOPBITS = {"1": serial.STOPBITS_ONE, "2": serial.STOPBITS_TWO}
+
+# Settings that require the port to be reopened when they change.
+PORT_SETTINGS = ("port", "baudrate", "bytesize", "parity", "stopbits",
+                 "timeout", "inter_byte_timeout", "low_latency")
+
+
+# Identifies the listed ports by (device, hwid) pairs.
+def _port_ids(ports_by_device):
+    return {(device, port.hwid) for device, port in ports_by_device.items()}
+
+
+# Reads one response terminated by LF into the worker's reusable buffer,
+# draining whatever the driver already holds in a single read instead of
+# pyserial's byte-by-byte readline(). The buffer is grown in place when a
+# reply does not fit, so long replies are never cut off.
+def _read_response(ser, timeout, buf):
+    deadline = None if timeout is None else time.monotonic() + timeout
+    n = 0
+    while True:
+        if n == len(buf):
+            buf.extend(bytes(len(buf)))
+        want = min(ser.in_waiting or 1, len(buf) - n)
+        with memoryview(buf) as mv:
+            n += ser.readinto(mv[n:n + want]) or 0
+        if n and buf[n - 1] == 0x0A:
+            break
+        if deadline is not None and time.monotonic() > deadline:
+            break
+    return bytes(buf[:n])
+
+
+# Yields `count` LF-terminated responses from a stream of replies to
+# back-to-back commands. Each response gets its own timeout; missing
+# responses are yielded as empty bytes.
+def _read_responses(ser, count, timeout):
+    pending = bytearray()
+    for _ in range(count):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        end = pending.find(b"\n")
+        while end < 0:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            pending += ser.read(ser.in_waiting or 1)
+            end = pending.find(b"\n")
+        if end < 0:
+            yield b""
+            continue
+        yield bytes(pending[:end + 1])
+        del pending[:end + 1]
+
+
+# Pipelining needs exactly one reply per command. Julabo set commands send
+# no reply: anything starting with "out_" (whether or not the parameter was
+# typed into the command text) and custom commands taking a parameter.
+def _all_commands_reply(commands):
+    return all(param is None and not cmd.startswith(SET_COMMAND_PREFIX) for cmd, param in commands)
+
+
+# Linux serial driver flag (see linux/serial.h). Setting ASYNC_LOW_LATENCY
+# drops the FTDI latency timer from 16 ms to 1 ms, which dominates the
+# round-trip time of short chiller replies.
+ASYNC_LOW_LATENCY = 1 << 13
+# Offset of "flags" in struct serial_struct: int type, line; unsigned port; int irq.
+SERIAL_FLAGS_OFFSET = 16
+
+
+def _enable_low_latency(ser):
+    import fcntl
+    import termios
+    buf = bytearray(128)
+    fcntl.ioctl(ser.fileno(), termios.TIOCGSERIAL, buf)
+    flags, = struct.unpack_from("i", buf, SERIAL_FLAGS_OFFSET)
+    struct.pack_into("i", buf, SERIAL_FLAGS_OFFSET, flags | ASYNC_LOW_LATENCY)
+    fcntl.ioctl(ser.fileno(), termios.TIOCSSERIAL, buf)
+
+
+# Encodes (command, parameter) tuples once per batch: list of (bytes, label).
+def _encode_commands(commands, append_newline):
+    encoded = []
+    for cmd, param in commands:
+        base_command = f"{cmd} {param}" if param else f"{cmd}"
+        full_command = base_command + ("\r\n" if append_newline else "\r")
+        encoded.append((full_command.encode("ascii"), base_command))
+    return encoded
+
+
+# Worker class: lives on a single long-running thread and keeps the serial
+# port open between batches. Each queue item is a (commands, settings) pair,
+# where commands is a list of (command, parameter) tuples and settings is a
+# dict holding the port configuration, an optional inter_byte_timeout, a flag
+# to append newline, a per-byte transmission delay, a command delay between
+# commands, an optional low-latency flag and a pipeline-mode flag. Putting
+# None on the queue stops the worker.
 class SerialWorker(QObject):
     update_signal = Signal(str)
+    batch_finished = Signal()
     finished = Signal()
 
-    def __init__(self, port, commands, baudrate=4800, bytesize=serial.SEVENBITS,
-                 parity=serial.PARITY_NONE, stopbits=serial.STOPBITS_TWO, timeout=1,
-                 inter_byte_timeout=None, append_newline=False, tx_delay=0, command_delay=0.06):
+    def __init__(self):
         super().__init__()
-        self.port = port
-        self.commands = commands  # list of tuples: (command, parameter)
-        self.baudrate = baudrate
-        self.bytesize = bytesize
-        self.parity = parity
-        self.stopbits = stopbits
-        self.timeout = timeout
-        self.inter_byte_timeout = inter_byte_timeout
-        self.append_newline = append_newline
-        self.tx_delay = tx_delay
-        self.command_delay = command_delay
+        self.q = queue.Queue()
+        self._ser = None
+        self._port_config = None
         self._is_running = True
+        # Log lines are batched and emitted together to limit GUI updates.
+        self._log_buf = []
+        self._last_log_emit = time.monotonic()
+        # Receive buffer reused for every response (grown on demand).
+        self._rx_buf = bytearray(RESPONSE_CHUNK)
 
     def run(self):
+        while self._is_running:
+            job = self.q.get()
+            if job is None:
+                break
+            commands, settings = job
+            self._send_batch(commands, settings)
+            self._flush_log()
+            self.batch_finished.emit()
+        self._close_port()
+        self._flush_log()
+        self.finished.emit()
+
+    def _send_batch(self, commands, settings):
         try:
-            ser = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                bytesize=self.bytesize,
-                parity=self.parity,
-                stopbits=self.stopbits,
-                timeout=self.timeout,
-                inter_byte_timeout=self.inter_byte_timeout
-            )
-            for cmd, param in self.commands:
+            ser = self._open_port(settings)
+            # The port stays open between batches; drop late replies left over
+            # from the previous one so they are not credited to this batch.
+            ser.reset_input_buffer()
+            encoded = _encode_commands(commands, settings["append_newline"])
+            if settings["pipeline"]:
+                if settings["tx_delay"] > 0:
+                    self._log("Pipeline mode skipped: byte delay is enabled, sending one at a time.")
+                elif not _all_commands_reply(commands):
+                    self._log("Pipeline mode skipped: set commands do not reply, sending one at a time.")
+                else:
+                    self._send_pipelined(ser, encoded, settings)
+                    return
+            # Bind loop-invariant lookups to locals for the per-command loop.
+            tx_delay = settings["tx_delay"]
+            command_delay = settings["command_delay"]
+            timeout = settings["timeout"]
+            rx_buf = self._rx_buf
+            log = self._log
+            log_response = self._log_response
+            write = ser.write
+            sleep = time.sleep
+            for buf, label in encoded:
                 if not self._is_running:
                     break
-                if param is not None and param != "":
-                    base_command = f"{cmd} {param}"
+                log(f"Sending: {label}")
+                if tx_delay > 0:
+                    for i in range(len(buf)):
+                        write(buf[i:i + 1])
+                        sleep(tx_delay)
                 else:
-                    base_command = f"{cmd}"
-                if self.append_newline:
-                    full_command = f"{base_command}\r\n"
-                else:
-                    full_command = f"{base_command}\r"
-                self.update_signal.emit(f"Sending: {full_command.strip()}")
-                if self.tx_delay > 0:
-                    for ch in full_command:
-                        ser.write(ch.encode("ascii"))
-                        ser.flush()
-                        time.sleep(self.tx_delay)
-                else:
-                    ser.write(full_command.encode("ascii"))
-                    ser.flush()
-                time.sleep(self.command_delay)
-                raw_response = ser.readline()
-                if not raw_response:
-                    response = "No response"
-                else:
-                    response = raw_response.decode("ascii", errors="ignore").rstrip("\r\n")
-                self.update_signal.emit(f"Received: {response}\n")
-            ser.close()
+                    write(buf)
+                sleep(command_delay)
+                log_response(_read_response(ser, timeout, rx_buf))
         except Exception as e:
-            self.update_signal.emit(f"Error: {e}")
-        self.finished.emit()
+            self._log(f"Error: {e}")
+            self._close_port()
+
+    # Pipeline mode: write every command in one go, wait the command delay
+    # once, then split the replies out of the response stream in order.
+    def _send_pipelined(self, ser, encoded, settings):
+        if not self._is_running:
+            return
+        for _, label in encoded:
+            self._log(f"Sending: {label}")
+        ser.write(b"".join(buf for buf, _ in encoded))
+        time.sleep(settings["command_delay"])
+        for raw_response in _read_responses(ser, len(encoded), settings["timeout"]):
+            if not self._is_running:
+                break
+            self._log_response(raw_response)
+
+    def _log_response(self, raw_response):
+        if not raw_response:
+            response = "No response"
+        else:
+            response = raw_response.decode("ascii", errors="ignore").rstrip("\r\n")
+        self._log(f"Received: {response}\n")
+
+    def _open_port(self, settings):
+        port_config = {key: settings[key] for key in PORT_SETTINGS}
+        if self._ser is not None and port_config == self._port_config:
+            return self._ser
+        self._close_port()
+        ser = serial.Serial(
+            port=port_config["port"],
+            baudrate=port_config["baudrate"],
+            bytesize=port_config["bytesize"],
+            parity=port_config["parity"],
+            stopbits=port_config["stopbits"],
+            timeout=port_config["timeout"],
+            inter_byte_timeout=port_config["inter_byte_timeout"]
+        )
+        if port_config["low_latency"]:
+            if sys.platform.startswith("linux"):
+                try:
+                    _enable_low_latency(ser)
+                except OSError as e:
+                    self._log(f"Low latency mode not available: {e}")
+            else:
+                self._log("Low latency mode is only supported on Linux.")
+        self._ser = ser
+        self._port_config = port_config
+        return ser
+
+    def _close_port(self):
+        if self._ser is not None:
+            try:
+                self._ser.close()
+            except Exception:
+                pass
+        self._ser = None
+        self._port_config = None
+
+    def _log(self, msg):
+        self._log_buf.append(msg)
+        if len(self._log_buf) >= LOG_BATCH_LINES or time.monotonic() - self._last_log_emit > LOG_BATCH_INTERVAL:
+            self._flush_log()
+
+    def _flush_log(self):
+        if self._log_buf:
+            self.update_signal.emit("\n".join(self._log_buf))
+            self._log_buf = []
+        self._last_log_emit = time.monotonic()
 
     def stop(self):
         self._is_running = False
+        self.q.put(None)
 
 
 class MainWindow(QWidget):
@@ -113,6 +299,8 @@ class MainWindow(QWidget):
         # Port info label.
         self.port_info_label = QLabel("Select a port to see details.")
         main_layout.addWidget(self.port_info_label)
+        # Ports currently listed in the combo box, keyed by device name.
+        self._ports_by_device = None
         self.populate_ports()
         self.port_combo.currentIndexChanged.connect(self.show_port_info)
 
@@ -137,6 +325,8 @@ class MainWindow(QWidget):
         self.inter_byte_timeout_edit = QLineEdit()
         self.inter_byte_timeout_edit.setPlaceholderText("Timeout in seconds (e.g., 0.05)")
         self.inter_byte_timeout_edit.setEnabled(False)
+        self.inter_byte_timeout_edit.textChanged.connect(self._on_inter_byte_timeout_changed)
+        self._on_inter_byte_timeout_changed()
         timeout_layout.addWidget(self.inter_byte_timeout_checkbox)
         timeout_layout.addWidget(self.inter_byte_timeout_edit)
         main_layout.addLayout(timeout_layout)
@@ -152,6 +342,8 @@ class MainWindow(QWidget):
         self.tx_delay_edit = QLineEdit()
         self.tx_delay_edit.setPlaceholderText("Delay in seconds per byte (e.g., 0.01)")
         self.tx_delay_edit.setEnabled(False)
+        self.tx_delay_edit.textChanged.connect(self._on_tx_delay_changed)
+        self._on_tx_delay_changed()
         tx_delay_layout.addWidget(self.tx_delay_checkbox)
         tx_delay_layout.addWidget(self.tx_delay_edit)
         main_layout.addLayout(tx_delay_layout)
@@ -163,10 +355,22 @@ class MainWindow(QWidget):
         self.command_delay_edit.setPlaceholderText("Delay in seconds (default 0.06)")
         self.command_delay_edit.setText("0.06")
         self.command_delay_edit.setEnabled(False)
+        self.command_delay_edit.textChanged.connect(self._on_command_delay_changed)
+        self._on_command_delay_changed()
         command_delay_layout.addWidget(self.command_delay_checkbox)
         command_delay_layout.addWidget(self.command_delay_edit)
         main_layout.addLayout(command_delay_layout)
 
+        low_latency_layout = QHBoxLayout()
+        self.low_latency_checkbox = QCheckBox("Enable low-latency mode (Linux, FTDI adapters)")
+        low_latency_layout.addWidget(self.low_latency_checkbox)
+        main_layout.addLayout(low_latency_layout)
+
+        pipeline_layout = QHBoxLayout()
+        self.pipeline_checkbox = QCheckBox("Pipeline mode (send all commands at once, no byte delay)")
+        pipeline_layout.addWidget(self.pipeline_checkbox)
+        main_layout.addLayout(pipeline_layout)
+
         # --- Bottom Buttons ---
         button_layout = QHBoxLayout()
         self.start_button = QPushButton("Start Communication")
@@ -176,15 +380,26 @@ class MainWindow(QWidget):
         button_layout.addWidget(self.clear_log_button)
         main_layout.addLayout(button_layout)
 
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(LOG_MAX_LINES)
         main_layout.addWidget(self.log_text)
 
         self.start_button.clicked.connect(self.start_communication)
-        self.thread = None
-        self.worker = None
+
+        # Single long-lived worker thread; the port stays open between runs.
+        self.thread = QThread()
+        self.worker = SerialWorker()
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.update_signal.connect(self.log_message)
+        self.worker.batch_finished.connect(lambda: self.start_button.setEnabled(True))
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.start()
 
         self.custom_command_counter = 0
+        # Maps custom command id -> its item in the unified command list.
+        self._id_to_unified = {}
 
     def create_port_settings_tab(self):
         self.port_settings_tab = QWidget()
@@ -210,6 +425,17 @@ class MainWindow(QWidget):
         self.timeout_edit = QLineEdit("1")
         layout.addRow("Timeout (sec):", self.timeout_edit)
         self.port_settings_tab.setLayout(layout)
+        # Parsed values are cached whenever a setting changes.
+        self.baudrate_edit.textChanged.connect(self._on_baudrate_changed)
+        self.bytesize_combo.currentIndexChanged.connect(self._on_bytesize_changed)
+        self.parity_combo.currentIndexChanged.connect(self._on_parity_changed)
+        self.stopbits_combo.currentIndexChanged.connect(self._on_stopbits_changed)
+        self.timeout_edit.textChanged.connect(self._on_timeout_changed)
+        self._on_baudrate_changed()
+        self._on_bytesize_changed()
+        self._on_parity_changed()
+        self._on_stopbits_changed()
+        self._on_timeout_changed()
 
     def create_commands_tab(self):
         self.commands_tab = QWidget()
@@ -242,7 +468,11 @@ class MainWindow(QWidget):
         self.out_params_group = QGroupBox("Out Command Parameters")
         self.out_params_layout = QVBoxLayout()
         self.out_params_widgets = {}
-        for cmd in ["out_sp_00", "out_mode_05"]:
+        # Parameter rows created for custom commands: text -> (hlayout, label, line_edit),
+        # plus how many custom commands currently share each row.
+        self.out_params_rows = {}
+        self._out_params_row_users = {}
+        for cmd in OUT_COMMANDS:
             hlayout = QHBoxLayout()
             label = QLabel(cmd)
             line_edit = QLineEdit()
@@ -282,10 +512,17 @@ class MainWindow(QWidget):
         layout.addWidget(custom_list_group)
 
     def populate_ports(self):
+        ports = {port.device: port for port in serial.tools.list_ports.comports()}
+        # Compare (device, hwid) so a different adapter on the same device name
+        # still refreshes the port details.
+        if self._ports_by_device is not None and _port_ids(ports) == _port_ids(self._ports_by_device):
+            return
+        blocker = QSignalBlocker(self.port_combo)
         self.port_combo.clear()
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            self.port_combo.addItem(port.device, port)
+        for device, port in ports.items():
+            self.port_combo.addItem(device, port)
+        blocker.unblock()
+        self._ports_by_device = ports
         if self.port_combo.count() == 0:
             self.port_info_label.setText("No serial ports found.")
         else:
@@ -297,18 +534,18 @@ class MainWindow(QWidget):
         if port_info is None:
             self.port_info_label.setText("No info available.")
         else:
-            info_text = (
-                f"Device: {port_info.device}\n"
-                f"Description: {port_info.description}\n"
-                f"HWID: {port_info.hwid}\n"
-            )
+            parts = [
+                f"Device: {port_info.device}",
+                f"Description: {port_info.description}",
+                f"HWID: {port_info.hwid}",
+            ]
             if port_info.manufacturer:
-                info_text += f"Manufacturer: {port_info.manufacturer}\n"
+                parts.append(f"Manufacturer: {port_info.manufacturer}")
             if port_info.vid:
-                info_text += f"VID: {hex(port_info.vid)}\n"
+                parts.append(f"VID: {hex(port_info.vid)}")
             if port_info.pid:
-                info_text += f"PID: {hex(port_info.pid)}\n"
-            self.port_info_label.setText(info_text)
+                parts.append(f"PID: {hex(port_info.pid)}")
+            self.port_info_label.setText("\n".join(parts))
 
     def toggle_manual_entry(self, _):
         if self.manual_checkbox.isChecked():
@@ -340,6 +577,45 @@ class MainWindow(QWidget):
         else:
             self.command_delay_edit.setEnabled(False)
 
+    def _on_baudrate_changed(self, _=None):
+        try:
+            self._baudrate = int(self.baudrate_edit.text().strip())
+        except ValueError:
+            self._baudrate = 4800
+
+    def _on_bytesize_changed(self, _=None):
+        self._bytesize = BYTESIZES.get(self.bytesize_combo.currentText().strip(), serial.EIGHTBITS)
+
+    def _on_parity_changed(self, _=None):
+        self._parity = PARITIES.get(self.parity_combo.currentText().strip().upper(), serial.PARITY_NONE)
+
+    def _on_stopbits_changed(self, _=None):
+        self._stopbits = STOPBITS.get(self.stopbits_combo.currentText().strip(), serial.STOPBITS_TWO)
+
+    def _on_timeout_changed(self, _=None):
+        try:
+            self._timeout = float(self.timeout_edit.text().strip())
+        except ValueError:
+            self._timeout = 1
+
+    def _on_inter_byte_timeout_changed(self, _=None):
+        try:
+            self._inter_byte_timeout = float(self.inter_byte_timeout_edit.text().strip())
+        except ValueError:
+            self._inter_byte_timeout = None
+
+    def _on_tx_delay_changed(self, _=None):
+        try:
+            self._tx_delay = float(self.tx_delay_edit.text().strip())
+        except ValueError:
+            self._tx_delay = 0
+
+    def _on_command_delay_changed(self, _=None):
+        try:
+            self._command_delay = float(self.command_delay_edit.text().strip())
+        except ValueError:
+            self._command_delay = 0.06
+
     def select_all(self):
         for i in range(self.command_list.count()):
             item = self.command_list.item(i)
@@ -362,12 +638,15 @@ class MainWindow(QWidget):
         item_unified.setCheckState(Qt.Checked)
         item_unified.setData(Qt.UserRole, {"custom": True, "accepts_param": accepts_param, "id": cmd_id})
         self.command_list.addItem(item_unified)
+        self._id_to_unified[cmd_id] = item_unified
         item_custom = QListWidgetItem(cmd_text)
         item_custom.setFlags(item_custom.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
         item_custom.setCheckState(Qt.Checked)
         item_custom.setData(Qt.UserRole, {"id": cmd_id})
         self.custom_list_display.addItem(item_custom)
-        if accepts_param and cmd_text not in self.out_params_widgets:
+        if accepts_param and cmd_text in self.out_params_rows:
+            self._out_params_row_users[cmd_text] += 1
+        elif accepts_param and cmd_text not in self.out_params_widgets:
             hlayout = QHBoxLayout()
             label = QLabel(cmd_text)
             line_edit = QLineEdit()
@@ -375,6 +654,8 @@ class MainWindow(QWidget):
             hlayout.addWidget(line_edit)
             self.out_params_layout.addLayout(hlayout)
             self.out_params_widgets[cmd_text] = line_edit
+            self.out_params_rows[cmd_text] = (hlayout, label, line_edit)
+            self._out_params_row_users[cmd_text] = 1
         self.custom_command_edit.clear()
         self.custom_param_checkbox.setChecked(False)
 
@@ -386,17 +667,26 @@ class MainWindow(QWidget):
                 cmd_id = data["id"]
                 row = self.custom_list_display.row(item)
                 self.custom_list_display.takeItem(row)
-                indices_to_remove = []
-                for i in range(self.command_list.count()):
-                    unified_item = self.command_list.item(i)
-                    udata = unified_item.data(Qt.UserRole)
-                    if udata and udata.get("custom") and udata.get("id") == cmd_id:
-                        indices_to_remove.append(i)
-                for index in reversed(indices_to_remove):
-                    removed_item = self.command_list.takeItem(index)
-                    cmd_text = removed_item.text()
-                    if cmd_text in self.out_params_widgets:
-                        del self.out_params_widgets[cmd_text]
+                item_unified = self._id_to_unified.pop(cmd_id, None)
+                if item_unified is not None:
+                    removed_item = self.command_list.takeItem(self.command_list.row(item_unified))
+                    udata = removed_item.data(Qt.UserRole)
+                    if udata.get("accepts_param"):
+                        self._release_param_row(removed_item.text())
+
+    def _release_param_row(self, cmd_text):
+        if cmd_text not in self.out_params_rows:
+            return
+        self._out_params_row_users[cmd_text] -= 1
+        if self._out_params_row_users[cmd_text] > 0:
+            return
+        del self._out_params_row_users[cmd_text]
+        hlayout, label, line_edit = self.out_params_rows.pop(cmd_text)
+        del self.out_params_widgets[cmd_text]
+        line_edit.deleteLater()
+        label.deleteLater()
+        self.out_params_layout.removeItem(hlayout)
+        hlayout.deleteLater()
 
     def clear_log(self):
         self.log_text.clear()
@@ -404,23 +694,18 @@ class MainWindow(QWidget):
     def start_communication(self):
         self.start_button.setEnabled(False)
         commands_to_send = []
-        for i in range(self.command_list.count()):
-            item = self.command_list.item(i)
-            if item.checkState() == Qt.Checked:
-                cmd = item.text()
-                custom_data = item.data(Qt.UserRole)
-                if custom_data is not None:
-                    accepts_param = custom_data.get("accepts_param", False)
-                    if accepts_param:
-                        param_value = self.out_params_widgets.get(cmd).text().strip() if self.out_params_widgets.get(cmd) else ""
-                        commands_to_send.append((cmd, param_value))
-                    else:
-                        commands_to_send.append((cmd, None))
-                elif cmd in ["out_sp_00", "out_mode_05"]:
-                    param = self.out_params_widgets.get(cmd).text().strip() if self.out_params_widgets.get(cmd) else ""
-                    commands_to_send.append((cmd, param))
-                else:
-                    commands_to_send.append((cmd, None))
+        for item in [self.command_list.item(i) for i in range(self.command_list.count())]:
+            if item.checkState() != Qt.Checked:
+                continue
+            cmd = item.text()
+            custom_data = item.data(Qt.UserRole)
+            if custom_data is not None:
+                takes_param = custom_data.get("accepts_param", False)
+            else:
+                takes_param = cmd in OUT_CMD_SET
+            line_edit = self.out_params_widgets.get(cmd) if takes_param else None
+            param = line_edit.text().strip() if line_edit is not None else None
+            commands_to_send.append((cmd, param))
         if self.manual_checkbox.isChecked():
             port = self.manual_port_edit.text().strip()
         else:
@@ -430,76 +715,37 @@ class MainWindow(QWidget):
             else:
                 port = port_obj.device
 
-        if self.inter_byte_timeout_checkbox.isChecked():
-            try:
-                inter_byte_timeout = float(self.inter_byte_timeout_edit.text().strip())
-            except Exception:
-                inter_byte_timeout = None
-        else:
-            inter_byte_timeout = None
-
+        inter_byte_timeout = self._inter_byte_timeout if self.inter_byte_timeout_checkbox.isChecked() else None
         append_newline = self.append_newline_checkbox.isChecked()
-
-        if self.tx_delay_checkbox.isChecked():
-            try:
-                tx_delay = float(self.tx_delay_edit.text().strip())
-            except Exception:
-                tx_delay = 0
-        else:
-            tx_delay = 0
-
-        if self.command_delay_checkbox.isChecked():
-            try:
-                command_delay = float(self.command_delay_edit.text().strip())
-            except Exception:
-                command_delay = 0.06
-        else:
-            command_delay = 0.06
-
-        try:
-            baudrate = int(self.baudrate_edit.text().strip())
-        except Exception:
-            baudrate = 4800
-        bytesize_val = self.bytesize_combo.currentText().strip()
-        if bytesize_val == "7":
-            bytesize = serial.SEVENBITS
-        else:
-            bytesize = serial.EIGHTBITS
-        parity_val = self.parity_combo.currentText().strip().upper()
-        if parity_val == "N":
-            parity = serial.PARITY_NONE
-        elif parity_val == "E":
-            parity = serial.PARITY_EVEN
-        elif parity_val == "O":
-            parity = serial.PARITY_ODD
-        else:
-            parity = serial.PARITY_NONE
-        stopbits_val = self.stopbits_combo.currentText().strip()
-        if stopbits_val == "1":
-            stopbits = serial.STOPBITS_ONE
-        else:
-            stopbits = serial.STOPBITS_TWO
-        try:
-            timeout = float(self.timeout_edit.text().strip())
-        except Exception:
-            timeout = 1
-
-        self.thread = QThread()
-        self.worker = SerialWorker(port, commands_to_send, baudrate=baudrate, bytesize=bytesize,
-                                     parity=parity, stopbits=stopbits, timeout=timeout,
-                                     inter_byte_timeout=inter_byte_timeout, append_newline=append_newline,
-                                     tx_delay=tx_delay, command_delay=command_delay)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
-        self.worker.update_signal.connect(self.log_message)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.finished.connect(lambda: self.start_button.setEnabled(True))
-        self.thread.start()
+        tx_delay = self._tx_delay if self.tx_delay_checkbox.isChecked() else 0
+        command_delay = self._command_delay if self.command_delay_checkbox.isChecked() else 0.06
+        low_latency = self.low_latency_checkbox.isChecked()
+        pipeline = self.pipeline_checkbox.isChecked()
+
+        settings = {
+            "port": port,
+            "baudrate": self._baudrate,
+            "bytesize": self._bytesize,
+            "parity": self._parity,
+            "stopbits": self._stopbits,
+            "timeout": self._timeout,
+            "inter_byte_timeout": inter_byte_timeout,
+            "low_latency": low_latency,
+            "append_newline": append_newline,
+            "tx_delay": tx_delay,
+            "command_delay": command_delay,
+            "pipeline": pipeline,
+        }
+        self.worker.q.put((commands_to_send, settings))
 
     def log_message(self, msg):
-        self.log_text.append(msg)
+        self.log_text.appendPlainText(msg)
+
+    def closeEvent(self, event):
+        self.worker.stop()
+        self.thread.quit()
+        self.thread.wait()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":